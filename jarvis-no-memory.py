@@ -1,6 +1,12 @@
 # -*- coding: utf-8 -*-
 
-import requests
+import asyncio
+import atexit
+import os
+import threading
+
+import httpx
+import orjson
 import flet as ft
 
 # ===================== OLLAMA CONFIG =====================
@@ -8,8 +14,61 @@ import flet as ft
 # Make sure Ollama is running and you have:
 #   ollama pull llama3.2
 OLLAMA_URL = "http://localhost:11434/api/chat"
+OLLAMA_GENERATE_URL = "http://localhost:11434/api/generate"
 MODEL_NAME = "llama3.2"
 
+# One shared client so every chat turn reuses the same connection to
+# Ollama, with HTTP/2 so concurrent requests multiplex instead of queueing.
+_CLIENT = httpx.Client(
+    http2=True,
+    limits=httpx.Limits(max_keepalive_connections=40, keepalive_expiry=30.0),
+    timeout=httpx.Timeout(300.0, connect=10.0),
+    # Bodies are pre-encoded with orjson, so set the content type once here
+    headers={"Content-Type": "application/json"},
+)
+atexit.register(_CLIENT.close)
+
+
+# Constant request fields serialized once; per call only the messages
+# list is freshly encoded and spliced in. keep_alive pins the model
+# resident between turns; the options right-size context and threads.
+# You can add more options if you want, for example: "temperature": 0.5
+_BODY_PRELUDE = orjson.dumps(
+    {
+        "model": MODEL_NAME,
+        "stream": False,
+        "keep_alive": "30m",
+        "options": {
+            "num_ctx": 4096,
+            "num_predict": 512,
+            "num_thread": max(1, (os.cpu_count() or 2) // 2),
+        },
+    }
+)[:-1] + b',"messages":'
+_BODY_SUFFIX = b"}"
+
+
+def _warmup():
+    """
+    Prime Ollama in the background so the model weights are already
+    resident (pinned by keep_alive) when the first real message lands.
+    Best effort: any failure just means the first turn loads the model.
+    """
+    try:
+        _CLIENT.post(
+            OLLAMA_GENERATE_URL,
+            content=orjson.dumps(
+                {
+                    "model": MODEL_NAME,
+                    "prompt": "",
+                    "keep_alive": "30m",
+                    "options": {"num_predict": 1},
+                }
+            ),
+        )
+    except Exception:
+        pass
+
 
 def call_model_api(messages):
     """
@@ -17,19 +76,14 @@ def call_model_api(messages):
     messages: list of {"role": "...", "content": "..."}
     Returns a string reply.
     """
-    body = {
-        "model": MODEL_NAME,
-        "messages": messages,
-        "stream": False,
-        # You can add options here if you want, for example:
-        # "options": {"temperature": 0.5, "num_predict": 256}
-    }
+    body = _BODY_PRELUDE + orjson.dumps(messages) + _BODY_SUFFIX
 
     try:
-        # Long timeout so llama3.2 can handle heavy conversations
-        resp = requests.post(OLLAMA_URL, json=body, timeout=300)
+        # The shared client carries a long timeout so llama3.2 can
+        # handle heavy conversations
+        resp = _CLIENT.post(OLLAMA_URL, content=body)
         resp.raise_for_status()
-        data = resp.json()
+        data = orjson.loads(resp.content)
 
         # Expected shape:
         # {
@@ -49,7 +103,19 @@ def call_model_api(messages):
 
 # ===================== FLET UI (WINDOW) =====================
 
+# Hoisted once so per-bubble construction skips the attribute lookups
+SEND_ICON = ft.Icons.SEND
+USER_BUBBLE_COLOR = ft.Colors.BLUE_300
+BOT_BUBBLE_COLOR = ft.Colors.GREY_800
+USER_BUBBLE_ALIGN = ft.MainAxisAlignment.END
+BOT_BUBBLE_ALIGN = ft.MainAxisAlignment.START
+
+
 def main(page: ft.Page):
+    # Start loading the model now; it is usually resident by the time
+    # the user finishes typing their first message
+    threading.Thread(target=_warmup, daemon=True).start()
+
     # Window / tab setup
     page.title = "J.A.R.V.I.S. (No Memory)"
     page.theme_mode = ft.ThemeMode.DARK
@@ -78,9 +144,18 @@ def main(page: ft.Page):
 
     # Send button
     send_button = ft.IconButton(
-        icon=ft.Icons.SEND,
+        icon=SEND_ICON,
     )
 
+    # Bubble width, computed once per resize instead of once per bubble
+    bubble_width = [page.width * 0.75 if page.width else None]
+
+    def handle_resize(_):
+        bubble_width[0] = page.width * 0.75 if page.width else None
+        page.update()
+
+    page.on_resized = handle_resize
+
     # Conversation history (only in RAM for this run)
     conversation = [
         {
@@ -94,9 +169,13 @@ def main(page: ft.Page):
     ]
 
     def add_message(text, is_user):
-        """Add a chat bubble to the UI."""
-        color = ft.Colors.BLUE_300 if is_user else ft.Colors.GREY_800
-        align = ft.MainAxisAlignment.END if is_user else ft.MainAxisAlignment.START
+        """
+        Add a chat bubble to the UI.
+        The caller is responsible for the page.update() flush, so several
+        mutations can be batched into one round-trip.
+        """
+        color = USER_BUBBLE_COLOR if is_user else BOT_BUBBLE_COLOR
+        align = USER_BUBBLE_ALIGN if is_user else BOT_BUBBLE_ALIGN
 
         chat.controls.append(
             ft.Row(
@@ -106,40 +185,39 @@ def main(page: ft.Page):
                         bgcolor=color,
                         padding=10,
                         border_radius=8,
-                        width=page.width * 0.75 if page.width else None,
+                        width=bubble_width[0],
                     )
                 ],
                 alignment=align,
             )
         )
-        page.update()
 
-    def handle_send(_):
+    async def handle_send(_):
         user_text = input_box.value.strip()
         if not user_text:
             return
 
-        # Show user message
+        # Show user message, clear and disable input while thinking —
+        # all in a single round-trip. Disabling matters: the handler is
+        # async, so a second send while this one is awaiting would
+        # interleave two turns on the shared conversation list.
         add_message(user_text, is_user=True)
         input_box.value = ""
+        input_box.disabled = True
+        send_button.disabled = True
         page.update()
 
         # Add to in‑memory conversation history
         conversation.append({"role": "user", "content": user_text})
 
-        # Disable input while thinking
-        input_box.disabled = True
-        send_button.disabled = True
-        page.update()
-
-        # Send full in‑RAM history (for this run only)
-        reply = call_model_api(conversation)
+        # Run the blocking HTTP call in a worker thread; the await point
+        # yields control so the window keeps repainting while the model
+        # thinks.
+        reply = await asyncio.to_thread(call_model_api, list(conversation))
 
-        # Update history and show assistant reply
+        # Update history, show assistant reply, re-enable input — one flush
         conversation.append({"role": "assistant", "content": reply})
         add_message(reply, is_user=False)
-
-        # Re-enable input
         input_box.disabled = False
         send_button.disabled = False
         input_box.focus()
@@ -1,78 +1,474 @@
 # -*- coding: utf-8 -*-
 
+import asyncio
+import atexit
+import hashlib
+import mmap
 import os
-import json
-import requests
+import pickle
+import queue
+import threading
+import time
+from types import MappingProxyType
+
 import flet as ft
+import httpx
+import orjson
+
+# Base system message describing behavior. Read-only and shared by
+# every conversation, so nothing can mutate it in place and the prompt
+# prefix stays bit-identical across turns and sessions — which is what
+# keeps Ollama's prompt-prefix cache hot.
+_SYSTEM_MSG = MappingProxyType(
+    {
+        "role": "system",
+        "content": (
+            "You are J.A.R.V.I.S., a precise, technical AI assistant. "
+            "You help with coding, Linux, networking, and general questions. "
+            "Be clear and concise. You have a long-term memory file that may "
+            "contain facts the user previously told you; you can use them when helpful."
+        ),
+    }
+)
+
 
 # ===================== MEMORY CONFIG =====================
 
-MEMORY_FILE = "jarvis_memory.json"
+MEMORY_FILE = "jarvis_memory.jsonl"
+LEGACY_MEMORY_FILE = "jarvis_memory.json"
 MAX_MEMORY_MESSAGES = 60
 
+# Binary sidecar holding (mtime, parsed messages) so unchanged memory
+# files skip JSON parsing on launch
+MEMORY_CACHE_FILE = "jarvis_memory.cache"
+
+# Rotate the append log into a monthly archive once it grows past this
+MEMORY_ROTATE_BYTES = 10 * 1024 * 1024
+
+# Memory-map files bigger than this when loading, instead of reading
+# them into one big bytes object first; smaller files are not worth
+# the mmap setup cost
+MEMORY_MMAP_THRESHOLD = 256 * 1024
+
 
 def load_memory():
     """Load conversation history from disk, if present."""
     if not os.path.exists(MEMORY_FILE):
+        return _load_legacy_memory()
+    try:
+        st = os.stat(MEMORY_FILE)
+        cached = _read_memory_cache(st.st_mtime)
+        if cached is not None:
+            return _fix_system_drift(cached)
+        with open(MEMORY_FILE, "rb") as f:
+            if st.st_size > MEMORY_MMAP_THRESHOLD:
+                # Big log: map it so only the line being parsed is
+                # ever copied out of the page cache
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    messages = [
+                        orjson.loads(line)
+                        for line in iter(mm.readline, b"")
+                        if line.strip()
+                    ]
+            else:
+                messages = [orjson.loads(line) for line in f if line.strip()]
+        messages = messages[-MAX_MEMORY_MESSAGES:]
+        _write_memory_cache(st.st_mtime, messages)
+        return _fix_system_drift(messages)
+    except Exception:
+        pass
+    return []
+
+
+def _fix_system_drift(messages):
+    """Swap out a stored system message that no longer matches _SYSTEM_MSG."""
+    if (
+        messages
+        and messages[0].get("role") == "system"
+        and messages[0].get("content") != _SYSTEM_MSG["content"]
+    ):
+        messages[0] = _SYSTEM_MSG
+    return messages
+
+
+def _read_memory_cache(mtime):
+    """Return cached parsed messages if the memory file is unchanged."""
+    try:
+        with open(MEMORY_CACHE_FILE, "rb") as f:
+            cached_mtime, messages = pickle.load(f)
+        if cached_mtime == mtime:
+            return messages
+    except Exception:
+        pass
+    return None
+
+
+def _write_memory_cache(mtime, messages):
+    """Refresh the parsed-message cache for the given memory mtime."""
+    try:
+        with open(MEMORY_CACHE_FILE, "wb") as f:
+            pickle.dump((mtime, messages), f, pickle.HIGHEST_PROTOCOL)
+    except Exception:
+        # Cache is purely an optimization; ignore write failures
+        pass
+
+
+def _load_legacy_memory():
+    """Import history from the old single-blob jarvis_memory.json."""
+    if not os.path.exists(LEGACY_MEMORY_FILE):
         return []
     try:
-        with open(MEMORY_FILE, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        with open(LEGACY_MEMORY_FILE, "rb") as f:
+            if os.path.getsize(LEGACY_MEMORY_FILE) > MEMORY_MMAP_THRESHOLD:
+                # orjson rejects mmap objects themselves, so hand it a
+                # zero-copy memoryview over the mapped buffer instead
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    data = orjson.loads(memoryview(mm))
+            else:
+                data = orjson.loads(f.read())
         if isinstance(data, list):
-            return data
+            return _fix_system_drift(data[-MAX_MEMORY_MESSAGES:])
     except Exception:
         pass
     return []
 
 
+# Writes go through this queue to a single daemon thread, so the UI
+# event loop never waits on the filesystem. The atexit join makes sure
+# queued lines reach disk before the process exits.
+_DISK_Q = queue.Queue()
+
+
+def _drain_disk_queue():
+    while True:
+        data = _DISK_Q.get()
+        try:
+            _rotate_memory_if_needed()
+            with open(MEMORY_FILE, "ab") as f:
+                f.write(data)
+        except Exception:
+            # Do not crash the writer if saving fails
+            pass
+        finally:
+            _DISK_Q.task_done()
+
+
+threading.Thread(target=_drain_disk_queue, daemon=True).start()
+atexit.register(_DISK_Q.join)
+
+
+def append_memory(msg):
+    """Queue one message for appending to the memory log (one JSON line)."""
+    _DISK_Q.put_nowait(orjson.dumps(msg) + b"\n")
+
+
+# Digest of the last compacted snapshot written, to skip no-op rewrites
+_LAST_HASH = b""
+
+
 def save_memory(conversation):
-    """Save conversation history to disk (trimmed)."""
+    """
+    Write the compacted jarvis_memory.json snapshot (legacy format,
+    handy for other tools), skipping the write entirely when the
+    trimmed content has not changed since the last one.
+    """
+    global _LAST_HASH
     try:
         trimmed = conversation[-MAX_MEMORY_MESSAGES:]
-        with open(MEMORY_FILE, "w", encoding="utf-8") as f:
-            json.dump(trimmed, f, ensure_ascii=False, indent=2)
+        data = orjson.dumps(trimmed, option=orjson.OPT_INDENT_2, default=dict)
+        digest = hashlib.blake2b(data).digest()
+        if digest == _LAST_HASH:
+            return
+        with open(LEGACY_MEMORY_FILE, "wb") as f:
+            f.write(data)
+        _LAST_HASH = digest
     except Exception:
         # Do not crash the app if saving fails
         pass
 
 
+def _rotate_memory_if_needed():
+    """Archive the log by month once it gets too big."""
+    if (
+        os.path.exists(MEMORY_FILE)
+        and os.path.getsize(MEMORY_FILE) > MEMORY_ROTATE_BYTES
+    ):
+        archive = "jarvis_memory.{0}.jsonl".format(time.strftime("%Y-%m"))
+        if os.path.exists(archive):
+            # A rotation already happened this month; don't clobber it,
+            # fall back to a full-timestamp name instead
+            archive = "jarvis_memory.{0}.jsonl".format(
+                time.strftime("%Y-%m-%d_%H%M%S")
+            )
+        os.replace(MEMORY_FILE, archive)
+
+
 # ===================== OLLAMA CONFIG =====================
 
 # Make sure Ollama is running and you have:
 #   ollama pull llama3.2
-OLLAMA_URL = "http://localhost:11434/api/chat"
+OLLAMA_URL_BASE = "http://localhost:11434"
+OLLAMA_CHAT_URL = OLLAMA_URL_BASE + "/api/chat"
+OLLAMA_GENERATE_URL = OLLAMA_URL_BASE + "/api/generate"
 MODEL_NAME = "llama3.2"
 
+# Keep the model (weights + KV cache) resident between turns. Combined
+# with a byte-identical prompt prefix (same system message, history only
+# ever appended to), Ollama can reuse its KV cache for the shared prefix
+# instead of re-prefilling the whole conversation every turn.
+KEEP_ALIVE = "30m"
+
+# Right-size the context window and generation length instead of taking
+# Ollama's defaults, and use physical cores only (os.cpu_count reports
+# logical cores; hyperthreading does not help the matmul-bound decode).
+MODEL_OPTIONS = {
+    "num_ctx": 4096,
+    "num_predict": 512,
+    "num_thread": max(1, (os.cpu_count() or 2) // 2),
+}
+
+# How often (seconds) to push streamed tokens to the window.
+# Updating on every single token hammers the UI for no visible gain.
+STREAM_UPDATE_INTERVAL = 0.05
 
-def call_model_api(messages):
+
+def _build_body_prelude():
     """
-    Call local Ollama chat API.
-    messages: list of {"role": "...", "content": "..."}
-    Returns a string reply.
+    Serialize the constant chat-request fields once; per turn only the
+    messages list is freshly encoded and spliced in. Call again if
+    MODEL_NAME or KEEP_ALIVE is changed at runtime.
     """
-    body = {
+    constant_fields = {
         "model": MODEL_NAME,
-        "messages": messages,
-        "stream": False,
-        # you can add more params here if you want, e.g.:
-        # "options": {"temperature": 0.5, "num_predict": 256}
+        "stream": True,
+        "keep_alive": KEEP_ALIVE,
+        # you can add more params to MODEL_OPTIONS if you want, e.g.:
+        # "temperature": 0.5
+        "options": MODEL_OPTIONS,
     }
+    # Reopen the object so the messages list can be appended
+    return orjson.dumps(constant_fields)[:-1] + b',"messages":'
+
+
+_BODY_PRELUDE = _build_body_prelude()
+_BODY_SUFFIX = b"}"
+
+# One shared client so every turn reuses the same connection to Ollama,
+# with HTTP/2 so concurrent requests multiplex instead of queueing.
+_CLIENT = httpx.AsyncClient(
+    http2=True,
+    limits=httpx.Limits(max_keepalive_connections=40, keepalive_expiry=30.0),
+    timeout=httpx.Timeout(300.0, connect=10.0),
+    # Bodies are pre-encoded with orjson, so set the content type once here
+    headers={"Content-Type": "application/json"},
+)
+
+
+# ===================== SEMANTIC CACHE =====================
+
+# Replies for questions we have already answered are served straight
+# from this cache when a new question is close enough (by embedding
+# cosine similarity) to an old one, skipping the LLM entirely.
+# Requires: ollama pull nomic-embed-text
+
+OLLAMA_EMBED_URL = OLLAMA_URL_BASE + "/api/embeddings"
+EMBED_MODEL = "nomic-embed-text"
+CACHE_FILE = "jarvis_cache.npz"
+CACHE_SIM_THRESHOLD = 0.95
+
+_CACHE_REPLIES = []  # reply strings, row-aligned with _EMB_MATRIX
+# (capacity, D) float16 matrix of L2-normalized embeddings; half the
+# memory bandwidth of float32 for the similarity matmul. Capacity grows
+# by doubling so inserts stay amortized O(1) copies.
+_EMB_MATRIX = None
+_EMB_COUNT = 0  # rows of _EMB_MATRIX actually in use
+_CACHE_LOADED = False
+
+_NUMPY = None
+
+
+def _np():
+    """Import numpy on first cache use so app startup does not pay for it."""
+    global _NUMPY
+    if _NUMPY is None:
+        import numpy
+        _NUMPY = numpy
+    return _NUMPY
+
+
+def _load_cache():
+    """Load the semantic cache from disk on first use, if present."""
+    global _CACHE_REPLIES, _EMB_MATRIX, _EMB_COUNT, _CACHE_LOADED
+    if _CACHE_LOADED:
+        return
+    _CACHE_LOADED = True
+    if not os.path.exists(CACHE_FILE):
+        return
+    try:
+        np = _np()
+        with np.load(CACHE_FILE) as data:
+            _EMB_MATRIX = np.ascontiguousarray(data["emb"], dtype=np.float16)
+            _CACHE_REPLIES = [str(r) for r in data["replies"]]
+            _EMB_COUNT = len(_CACHE_REPLIES)
+    except Exception:
+        _CACHE_REPLIES = []
+        _EMB_MATRIX = None
+        _EMB_COUNT = 0
+
+
+def _reset_cache():
+    """Drop the cache, e.g. when it was built with another embedding model."""
+    global _CACHE_REPLIES, _EMB_MATRIX, _EMB_COUNT
+    _CACHE_REPLIES = []
+    _EMB_MATRIX = None
+    _EMB_COUNT = 0
+
+
+def _save_cache():
+    """Persist the semantic cache to disk."""
+    if _EMB_MATRIX is None or not _CACHE_REPLIES:
+        return
+    try:
+        np = _np()
+        np.savez(
+            CACHE_FILE,
+            emb=_EMB_MATRIX[:_EMB_COUNT],
+            replies=np.array(_CACHE_REPLIES),
+        )
+    except Exception:
+        # Do not crash the app if saving fails
+        pass
+
 
+atexit.register(_save_cache)
+
+
+async def _embed(text):
+    """Embed text via Ollama, L2-normalized. Returns None on any failure."""
     try:
-        # Long timeout so llama3.2 can handle heavy conversations
-        resp = requests.post(OLLAMA_URL, json=body, timeout=300)
+        np = _np()
+        resp = await _CLIENT.post(
+            OLLAMA_EMBED_URL,
+            content=orjson.dumps({"model": EMBED_MODEL, "prompt": text}),
+        )
         resp.raise_for_status()
-        data = resp.json()
-
-        # Expected shape:
-        # {
-        #   "message": { "role": "assistant", "content": "..." },
-        #   ...
-        # }
-        msg = data.get("message", {})
-        content = msg.get("content", "")
-        if content:
-            return content
+        v = np.asarray(orjson.loads(resp.content)["embedding"], dtype=np.float32)
+        norm = np.linalg.norm(v)
+        if norm:
+            v /= norm
+        return v
+    except Exception:
+        return None
+
+
+async def cache_lookup(text):
+    """
+    Look up text in the semantic cache.
+    Returns (cached_reply_or_None, embedding_or_None); the embedding is
+    handed back so a later cache_store does not have to re-embed.
+    """
+    _load_cache()
+    query = await _embed(text)
+    if query is None:
+        return None, None
+    if _EMB_COUNT:
+        if _EMB_MATRIX.shape[1] != query.shape[0]:
+            # Stale cache from a different embedding model; start over
+            # rather than crash the matmul (and later cache_store)
+            _reset_cache()
+        else:
+            # One matrix-vector product scores every cached entry at once
+            sims = _EMB_MATRIX[:_EMB_COUNT] @ query.astype(_EMB_MATRIX.dtype)
+            idx = int(sims.argmax())
+            if sims[idx] > CACHE_SIM_THRESHOLD:
+                return _CACHE_REPLIES[idx], query
+    return None, query
+
+
+def cache_store(embedding, reply):
+    """Add a (question embedding, reply) pair to the semantic cache."""
+    global _EMB_MATRIX, _EMB_COUNT
+    if embedding is None or not reply:
+        return
+    try:
+        np = _np()
+        row = embedding.astype(np.float16)
+        if _EMB_MATRIX is None:
+            _EMB_MATRIX = np.empty((8, row.shape[0]), dtype=np.float16)
+        elif _EMB_COUNT == len(_EMB_MATRIX):
+            # Full: double the capacity so inserts stay amortized O(1)
+            grown = np.empty(
+                (len(_EMB_MATRIX) * 2, row.shape[0]), dtype=np.float16
+            )
+            grown[:_EMB_COUNT] = _EMB_MATRIX[:_EMB_COUNT]
+            _EMB_MATRIX = grown
+        _EMB_MATRIX[_EMB_COUNT] = row
+        _EMB_COUNT += 1
+        _CACHE_REPLIES.append(reply)
+    except Exception:
+        # The cache is best effort; never let it break the reply path
+        pass
+
+
+async def _warmup():
+    """
+    Prime Ollama in the background so the model weights are already
+    resident (pinned by keep_alive) when the first real message lands.
+    Best effort: any failure just means the first turn loads the model.
+    """
+    try:
+        await _CLIENT.post(
+            OLLAMA_GENERATE_URL,
+            content=orjson.dumps(
+                {
+                    "model": MODEL_NAME,
+                    "prompt": "",
+                    "keep_alive": KEEP_ALIVE,
+                    "options": {"num_predict": 1},
+                }
+            ),
+        )
+    except Exception:
+        pass
+
+
+async def stream_model_reply(messages, on_token):
+    """
+    Stream a reply from the local Ollama chat API.
+    messages: list of {"role": "...", "content": "..."}
+    on_token: async callback invoked with the text so far as tokens arrive.
+    Returns the full reply string.
+    """
+    # default=dict lets orjson encode the read-only _SYSTEM_MSG proxy
+    body = _BODY_PRELUDE + orjson.dumps(messages, default=dict) + _BODY_SUFFIX
+
+    reply = ""
+    try:
+        async with _CLIENT.stream(
+            "POST", OLLAMA_CHAT_URL, content=body
+        ) as resp:
+            resp.raise_for_status()
+            # Ollama streams NDJSON, one chunk per line:
+            # {"message": {"role": "assistant", "content": "token"}, "done": false}
+            # Read raw byte chunks and split lines out of one reusable
+            # buffer, so orjson parses bytes without per-line decoding.
+            buf = bytearray()
+            async for data in resp.aiter_bytes(chunk_size=8192):
+                buf += data
+                while True:
+                    nl = buf.find(b"\n")
+                    if nl < 0:
+                        break
+                    if nl:
+                        chunk = orjson.loads(memoryview(buf)[:nl])
+                        msg = chunk.get("message")
+                        if msg is not None:
+                            reply += msg.get("content", "")
+                            await on_token(reply)
+                    del buf[: nl + 1]
+
+        if reply:
+            return reply
 
         return "J.A.R.V.I.S.: Local model returned an empty or unexpected response."
 
@@ -82,7 +478,15 @@ def call_model_api(messages):
 
 # ===================== FLET UI (WINDOW) =====================
 
-def main(page: ft.Page):
+# Hoisted once so per-bubble construction skips the attribute lookups
+SEND_ICON = ft.Icons.SEND
+USER_BUBBLE_COLOR = ft.Colors.BLUE_300
+BOT_BUBBLE_COLOR = ft.Colors.GREY_800
+USER_BUBBLE_ALIGN = ft.MainAxisAlignment.END
+BOT_BUBBLE_ALIGN = ft.MainAxisAlignment.START
+
+
+async def main(page: ft.Page):
     # Window / tab setup
     page.title = "J.A.R.V.I.S."
     page.theme_mode = ft.ThemeMode.DARK
@@ -111,110 +515,154 @@ def main(page: ft.Page):
 
     # Send button
     send_button = ft.IconButton(
-        icon=ft.Icons.SEND,
+        icon=SEND_ICON,
     )
 
-    # Base system message describing behavior
-    base_system_message = {
-        "role": "system",
-        "content": (
-            "You are J.A.R.V.I.S., a precise, technical AI assistant. "
-            "You help with coding, Linux, networking, and general questions. "
-            "Be clear and concise. You have a long-term memory file that may "
-            "contain facts the user previously told you; you can use them when helpful."
-        ),
-    }
+    # Bubble width, computed once per resize instead of once per bubble
+    bubble_width = [page.width * 0.75 if page.width else None]
+
+    def handle_resize(_):
+        bubble_width[0] = page.width * 0.75 if page.width else None
+        page.update()
+
+    page.on_resized = handle_resize
 
-    # Load memory from disk
+    # Load memory from disk; the shared read-only system message leads
     loaded = load_memory()
     if not loaded:
-        conversation = [base_system_message]
+        conversation = [_SYSTEM_MSG]
     else:
         if loaded[0].get("role") != "system":
-            loaded.insert(0, base_system_message)
+            loaded.insert(0, _SYSTEM_MSG)
         conversation = loaded
 
-    # Show any previous conversation in the UI (optional)
+    # Compacted snapshot once at exit; the JSONL log handles the per-turn writes
+    atexit.register(save_memory, conversation)
+
+    # Show any previous conversation in the UI (optional).
+    # Build all rows first and attach them with one extend, binding the
+    # Flet constructors locally for the tight loop.
+    _Row, _Container, _Text = ft.Row, ft.Container, ft.Text
+    rows = []
     for msg in conversation:
         role = msg.get("role")
-        content = msg.get("content", "")
         if role == "user":
-            color = ft.Colors.BLUE_300
-            align = ft.MainAxisAlignment.END
+            color = USER_BUBBLE_COLOR
+            align = USER_BUBBLE_ALIGN
         elif role == "assistant":
-            color = ft.Colors.GREY_800
-            align = ft.MainAxisAlignment.START
+            color = BOT_BUBBLE_COLOR
+            align = BOT_BUBBLE_ALIGN
         else:
             # system messages are not shown as bubbles
             continue
 
-        chat.controls.append(
-            ft.Row(
+        rows.append(
+            _Row(
                 controls=[
-                    ft.Container(
-                        content=ft.Text(content),
+                    _Container(
+                        content=_Text(msg.get("content", "")),
                         bgcolor=color,
                         padding=10,
                         border_radius=8,
-                        width=page.width * 0.75 if page.width else None,
+                        width=bubble_width[0],
                     )
                 ],
                 alignment=align,
             )
         )
 
+    chat.controls.extend(rows)
     page.update()
 
-    def add_message(text, is_user):
-        """Add a chat bubble to the UI."""
-        color = ft.Colors.BLUE_300 if is_user else ft.Colors.GREY_800
-        align = ft.MainAxisAlignment.END if is_user else ft.MainAxisAlignment.START
+    # Start loading the model now; it is usually resident by the time
+    # the user finishes typing their first message
+    asyncio.create_task(_warmup())
 
+    def add_message(text, is_user):
+        """
+        Add a chat bubble to the UI and return its Text control.
+        The caller is responsible for the page.update() flush, so several
+        mutations can be batched into one round-trip.
+        """
+        color = USER_BUBBLE_COLOR if is_user else BOT_BUBBLE_COLOR
+        align = USER_BUBBLE_ALIGN if is_user else BOT_BUBBLE_ALIGN
+
+        bubble_text = ft.Text(text)
         chat.controls.append(
             ft.Row(
                 controls=[
                     ft.Container(
-                        content=ft.Text(text),
+                        content=bubble_text,
                         bgcolor=color,
                         padding=10,
                         border_radius=8,
-                        width=page.width * 0.75 if page.width else None,
+                        width=bubble_width[0],
                     )
                 ],
                 alignment=align,
             )
         )
-        page.update()
+        return bubble_text
 
-    def handle_send(_):
+    async def handle_send(_):
         user_text = input_box.value.strip()
         if not user_text:
             return
 
-        # Show user message
+        # Show user message, clear and disable input while thinking —
+        # all flushed in a single round-trip
         add_message(user_text, is_user=True)
         input_box.value = ""
-        page.update()
-
-        # Add to conversation history and save
-        conversation.append({"role": "user", "content": user_text})
-        save_memory(conversation)
-
-        # Disable input while thinking
         input_box.disabled = True
         send_button.disabled = True
         page.update()
 
-        # For your experiment you want full history:
-        history_for_model = conversation  # send entire list
-        reply = call_model_api(history_for_model)
-
-        # Update history, save, and show assistant reply
-        conversation.append({"role": "assistant", "content": reply})
-        save_memory(conversation)
-        add_message(reply, is_user=False)
-
-        # Re-enable input
+        # Add to conversation history and append to the log on disk
+        user_msg = {"role": "user", "content": user_text}
+        conversation.append(user_msg)
+        append_memory(user_msg)
+
+        # Near-duplicate of an earlier question? Serve the cached reply
+        # instantly instead of hitting the model again.
+        cached_reply, query_emb = await cache_lookup(user_text)
+
+        # Empty assistant bubble; streamed tokens fill it in as they arrive
+        reply_text = add_message("", is_user=False)
+        last_update = time.monotonic()
+
+        async def on_token(text_so_far):
+            nonlocal last_update
+            reply_text.value = text_so_far
+            now = time.monotonic()
+            if now - last_update >= STREAM_UPDATE_INTERVAL:
+                last_update = now
+                page.update()
+
+        if cached_reply is not None:
+            reply = cached_reply
+        else:
+            # Pin the system message and send only the last N messages;
+            # without this the in-RAM list grows unboundedly within a
+            # session and per-turn prefill cost grows with it.
+            if len(conversation) > MAX_MEMORY_MESSAGES:
+                history_for_model = (
+                    [conversation[0]]
+                    + conversation[-(MAX_MEMORY_MESSAGES - 1):]
+                )
+            else:
+                history_for_model = conversation
+            reply = await stream_model_reply(history_for_model, on_token)
+            # Cache real replies only, never the error placeholders
+            if not reply.startswith("J.A.R.V.I.S.:"):
+                cache_store(query_emb, reply)
+
+        # Update history and save once the full reply is in
+        assistant_msg = {"role": "assistant", "content": reply}
+        conversation.append(assistant_msg)
+        append_memory(assistant_msg)
+
+        # Final reply text and re-enabled input in one flush
+        reply_text.value = reply
         input_box.disabled = False
         send_button.disabled = False
         input_box.focus()
@@ -238,5 +686,12 @@ def main(page: ft.Page):
     )
 
 
+# OLLAMA_NUM_PARALLEL must be set before `ollama serve` starts, so we
+# can only recommend it here, not apply it.
+print(
+    "J.A.R.V.I.S.: tip: run the Ollama server with OLLAMA_NUM_PARALLEL=2 "
+    "to let warm-up and chat requests overlap."
+)
+
 # Entry point: opens a desktop window
 ft.app(target=main, view=ft.AppView.FLET_APP)